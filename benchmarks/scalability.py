@@ -1,12 +1,67 @@
 import ast
 import os
-from pathlib import Path
 from typing import Optional
 
 SUPPORTED_LANGUAGES = {"any"}
 
 from .utils import get_python_files, parse_file
 
+# Import-based feature flags, one bit each. Once every bit is set the
+# per-import keyword matching can be skipped for the rest of the codebase.
+FLAG_ASYNCIO = 1 << 0
+FLAG_MULTIPROCESSING = 1 << 1
+FLAG_THREADING = 1 << 2
+FLAG_CACHING = 1 << 3
+FLAG_WEB_FRAMEWORK = 1 << 4
+FLAG_DATABASE = 1 << 5
+FLAG_QUEUE = 1 << 6
+FLAG_POOLING = 1 << 7
+FLAG_CONFIG = 1 << 8
+FULL_MASK = (1 << 9) - 1
+
+# Data-flow patterns found by _analyze_data_flow, one bit each
+FLOW_GENERATORS = 1 << 0
+FLOW_ITERATORS = 1 << 1
+FLOW_STREAMING = 1 << 2
+FLOW_BATCH = 1 << 3
+FLOW_PIPELINE = 1 << 4
+FLOW_ASYNC_PROCESSING = 1 << 5
+FLOW_FULL_MASK = (1 << 6) - 1
+
+# Extended keyword sets for better detection (substring-matched, so plain tuples)
+CACHING_KEYWORDS = ("redis", "memcached", "celery", "cache", "cachetools", "functools.lru_cache", "lru_cache")
+WEB_FRAMEWORK_KEYWORDS = ("flask", "django", "fastapi", "tornado", "bottle", "cherrypy", "pyramid", "starlette")
+DATABASE_KEYWORDS = ("sqlalchemy", "django.db", "psycopg2", "pymongo", "sqlite3", "mysql", "postgresql", "asyncpg", "aiomysql")
+QUEUE_KEYWORDS = ("celery", "rq", "kombu", "pika", "rabbitmq", "kafka", "sqs")
+THREADING_KEYWORDS = ("threading", "concurrent.futures", "thread", "threadpool")
+POOLING_KEYWORDS = ("pool", "connectionpool", "dbutils", "pooleddb")
+CONFIG_KEYWORDS = ("configparser", "environ", "settings", "config", "dotenv")
+MODULAR_PATTERNS = ("__init__.py", "from . import", "from ..", "package")
+
+# Statement-list fields. Imports, functions and classes are always statements,
+# so the structural walks only follow these and never descend into expressions.
+BLOCK_FIELDS = ("body", "orelse", "finalbody", "handlers", "cases")
+
+# Top-level package names, matched against the first dotted segment of an import
+INTERNAL_ROOTS = frozenset(("app", "src", "lib"))
+STDLIB_ROOTS = frozenset(("os", "sys", "json", "time", "datetime", "collections", "itertools"))
+
+
+def _import_flags(name_lower: str) -> int:
+    """Return the FLAG_* bits matched by a lower-cased imported module name."""
+    found = 0
+    if "asyncio" in name_lower: found |= FLAG_ASYNCIO
+    if "multiprocessing" in name_lower: found |= FLAG_MULTIPROCESSING
+    if any(kw in name_lower for kw in THREADING_KEYWORDS): found |= FLAG_THREADING
+    if any(kw in name_lower for kw in CACHING_KEYWORDS): found |= FLAG_CACHING
+    if any(kw in name_lower for kw in WEB_FRAMEWORK_KEYWORDS): found |= FLAG_WEB_FRAMEWORK
+    if any(kw in name_lower for kw in DATABASE_KEYWORDS): found |= FLAG_DATABASE
+    if any(kw in name_lower for kw in QUEUE_KEYWORDS): found |= FLAG_QUEUE
+    if any(kw in name_lower for kw in POOLING_KEYWORDS): found |= FLAG_POOLING
+    if any(kw in name_lower for kw in CONFIG_KEYWORDS): found |= FLAG_CONFIG
+    return found
+
+
 def assess_scalability(codebase_path: str):
     """
     Comprehensive scalability assessment looking at multiple scalability patterns and practices.
@@ -15,32 +70,15 @@ def assess_scalability(codebase_path: str):
     if not python_files:
         return 2.0, ["No Python files found - baseline score for potential scalability."]
 
-    # Scalability indicators
-    uses_asyncio = False
-    uses_multiprocessing = False
-    uses_threading = False
-    uses_caching_libs = False
-    uses_web_frameworks = False
-    uses_database_libs = False
-    uses_queue_systems = False
-    uses_connection_pooling = False
-    
+    # Scalability indicators (one bit per feature, see FLAG_* above)
+    flags = 0
+
     async_functions = 0
     total_functions = 0
     class_count = 0
     modular_structure = False
-    config_management = False
     details = []
     
-    # Extended keyword sets for better detection
-    caching_keywords = ["redis", "memcached", "celery", "cache", "cachetools", "functools.lru_cache", "lru_cache"]
-    web_framework_keywords = ["flask", "django", "fastapi", "tornado", "bottle", "cherrypy", "pyramid", "starlette"]
-    database_keywords = ["sqlalchemy", "django.db", "psycopg2", "pymongo", "sqlite3", "mysql", "postgresql", "asyncpg", "aiomysql"]
-    queue_keywords = ["celery", "rq", "kombu", "pika", "rabbitmq", "kafka", "sqs"]
-    threading_keywords = ["threading", "concurrent.futures", "thread", "threadpool"]
-    pooling_keywords = ["pool", "connectionpool", "dbutils", "pooleddb"]
-    config_keywords = ["configparser", "environ", "settings", "config", "dotenv"]
-
     for file_path in python_files:
         tree = parse_file(file_path)
         if not tree:
@@ -53,33 +91,23 @@ def assess_scalability(codebase_path: str):
         except:
             pass
 
-        for node in ast.walk(tree):
-            # Check imports
+        stack = list(tree.body)
+        while stack:
+            node = stack.pop()
+            for field in BLOCK_FIELDS:
+                block = getattr(node, field, None)
+                if block:
+                    stack.extend(block)
+            # Check imports - skipped once every feature flag is already set,
+            # the walk itself continues because functions/classes need a full count
             if isinstance(node, ast.Import):
-                for alias in node.names:
-                    name_lower = alias.name.lower()
-                    if "asyncio" in name_lower: uses_asyncio = True
-                    if "multiprocessing" in name_lower: uses_multiprocessing = True
-                    if any(kw in name_lower for kw in threading_keywords): uses_threading = True
-                    if any(kw in name_lower for kw in caching_keywords): uses_caching_libs = True
-                    if any(kw in name_lower for kw in web_framework_keywords): uses_web_frameworks = True
-                    if any(kw in name_lower for kw in database_keywords): uses_database_libs = True
-                    if any(kw in name_lower for kw in queue_keywords): uses_queue_systems = True
-                    if any(kw in name_lower for kw in pooling_keywords): uses_connection_pooling = True
-                    if any(kw in name_lower for kw in config_keywords): config_management = True
+                if flags != FULL_MASK:
+                    for alias in node.names:
+                        flags |= _import_flags(alias.name.lower())
                     
             elif isinstance(node, ast.ImportFrom):
-                if node.module:
-                    module_lower = node.module.lower()
-                    if "asyncio" in module_lower: uses_asyncio = True
-                    if "multiprocessing" in module_lower: uses_multiprocessing = True
-                    if any(kw in module_lower for kw in threading_keywords): uses_threading = True
-                    if any(kw in module_lower for kw in caching_keywords): uses_caching_libs = True
-                    if any(kw in module_lower for kw in web_framework_keywords): uses_web_frameworks = True
-                    if any(kw in module_lower for kw in database_keywords): uses_database_libs = True
-                    if any(kw in module_lower for kw in queue_keywords): uses_queue_systems = True
-                    if any(kw in module_lower for kw in pooling_keywords): uses_connection_pooling = True
-                    if any(kw in module_lower for kw in config_keywords): config_management = True
+                if node.module and flags != FULL_MASK:
+                    flags |= _import_flags(node.module.lower())
 
             # Count functions and classes
             elif isinstance(node, ast.FunctionDef):
@@ -91,9 +119,19 @@ def assess_scalability(codebase_path: str):
                 class_count += 1
 
         # Check for modular structure indicators in file content
-        if any(pattern in file_content for pattern in ["__init__.py", "from . import", "from ..", "package"]):
+        if any(pattern in file_content for pattern in MODULAR_PATTERNS):
             modular_structure = True
 
+    uses_asyncio = bool(flags & FLAG_ASYNCIO)
+    uses_multiprocessing = bool(flags & FLAG_MULTIPROCESSING)
+    uses_threading = bool(flags & FLAG_THREADING)
+    uses_caching_libs = bool(flags & FLAG_CACHING)
+    uses_web_frameworks = bool(flags & FLAG_WEB_FRAMEWORK)
+    uses_database_libs = bool(flags & FLAG_DATABASE)
+    uses_queue_systems = bool(flags & FLAG_QUEUE)
+    uses_connection_pooling = bool(flags & FLAG_POOLING)
+    config_management = bool(flags & FLAG_CONFIG)
+
     # Calculate comprehensive scalability score (2-10 scale, baseline 2.0)
     score = 2.0  # Baseline score - even basic code has some scalability potential
     
@@ -161,7 +199,8 @@ def assess_scalability(codebase_path: str):
     # ------------------------------------------------------------------ #
     # Static architectural scalability assessment
     # ------------------------------------------------------------------ #
-    architectural_score = _assess_static_architecture(python_files, codebase_path)
+    rel_paths = [os.path.relpath(f, codebase_path) for f in python_files]
+    architectural_score = _assess_static_architecture(python_files, rel_paths)
     if architectural_score > 0:
         details.append(f"🏗️ Architectural analysis: {architectural_score:.1f}/10")
         
@@ -174,16 +213,16 @@ def assess_scalability(codebase_path: str):
     return final_score, details
 
 
-def _assess_static_architecture(python_files, codebase_path: str) -> float:
+def _assess_static_architecture(python_files, rel_paths) -> float:
     """Deterministic architectural scalability assessment based on code structure."""
     arch_score = 0.0
     
     # 1. Analyze file organization and separation of concerns
-    file_structure_score = _analyze_file_structure(python_files, codebase_path)
+    file_structure_score = _analyze_file_structure(rel_paths)
     arch_score += file_structure_score
     
     # 2. Analyze import dependencies and coupling
-    dependency_score = _analyze_dependencies(python_files, codebase_path) 
+    dependency_score = _analyze_dependencies(python_files)
     arch_score += dependency_score
     
     # 3. Analyze design patterns and architectural decisions
@@ -197,21 +236,21 @@ def _assess_static_architecture(python_files, codebase_path: str) -> float:
     return min(10.0, arch_score)
 
 
-def _analyze_file_structure(python_files, codebase_path: str) -> float:
+def _analyze_file_structure(rel_paths) -> float:
     """Analyze file organization for scalability indicators."""
     score = 0.0
     
-    # Get relative paths for analysis
-    rel_paths = [os.path.relpath(f, codebase_path) for f in python_files]
+    # Relative paths are computed once by the caller; lower-case them once here
+    lowered = [path.lower() for path in rel_paths]
     
     # Check for clear separation of concerns
-    has_models = any('model' in path.lower() for path in rel_paths)
-    has_views = any('view' in path.lower() or 'template' in path.lower() for path in rel_paths)
-    has_controllers = any('controller' in path.lower() or 'handler' in path.lower() for path in rel_paths)
-    has_services = any('service' in path.lower() or 'business' in path.lower() for path in rel_paths)
-    has_utils = any('util' in path.lower() or 'helper' in path.lower() for path in rel_paths)
-    has_config = any('config' in path.lower() or 'setting' in path.lower() for path in rel_paths)
-    has_tests = any('test' in path.lower() for path in rel_paths)
+    has_models = any('model' in path for path in lowered)
+    has_views = any('view' in path or 'template' in path for path in lowered)
+    has_controllers = any('controller' in path or 'handler' in path for path in lowered)
+    has_services = any('service' in path or 'business' in path for path in lowered)
+    has_utils = any('util' in path or 'helper' in path for path in lowered)
+    has_config = any('config' in path or 'setting' in path for path in lowered)
+    has_tests = any('test' in path for path in lowered)
     
     # Layered architecture bonus
     if has_models and (has_views or has_controllers): score += 1.0
@@ -221,57 +260,62 @@ def _analyze_file_structure(python_files, codebase_path: str) -> float:
     if has_tests: score += 0.3
     
     # Directory depth analysis (deeper = more organized)
-    avg_depth = sum(len(Path(p).parts) for p in rel_paths) / len(rel_paths) if rel_paths else 1
+    # relpath() output is normalized, so separator count + 1 == len(Path(p).parts)
+    avg_depth = sum(p.count(os.sep) + 1 for p in rel_paths) / len(rel_paths) if rel_paths else 1
     if avg_depth > 2: score += 0.5
     if avg_depth > 3: score += 0.3
     
     # File count considerations
-    file_count = len(python_files)
+    file_count = len(rel_paths)
     if 5 <= file_count <= 20: score += 0.5  # Sweet spot
     elif file_count > 20: score += 0.3      # Large but manageable
     
     return min(2.5, score)
 
 
-def _analyze_dependencies(python_files, codebase_path: str) -> float:
+def _analyze_dependencies(python_files) -> float:
     """Analyze import dependencies and coupling."""
     score = 0.0
     total_imports = 0
     external_imports = 0
     internal_imports = 0
     circular_risk = 0
-    
-    import_graph = {}
+    stdlib_imports = 0
     
     for file_path in python_files:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
-            file_imports = []
+            tree = parse_file(file_path)
+            if not tree:
+                continue
             
-            for node in ast.walk(tree):
+            stack = list(tree.body)
+            while stack:
+                node = stack.pop()
+                for field in BLOCK_FIELDS:
+                    block = getattr(node, field, None)
+                    if block:
+                        stack.extend(block)
                 if isinstance(node, ast.Import):
                     for alias in node.names:
-                        file_imports.append(alias.name)
                         total_imports += 1
-                        if alias.name.startswith('.') or any(alias.name.startswith(p) for p in ['app', 'src', 'lib']):
+                        root = alias.name.split('.', 1)[0]
+                        if root in STDLIB_ROOTS:
+                            stdlib_imports += 1
+                        if root in INTERNAL_ROOTS:
                             internal_imports += 1
                         else:
                             external_imports += 1
                             
                 elif isinstance(node, ast.ImportFrom) and node.module:
-                    file_imports.append(node.module)
                     total_imports += 1
-                    if node.module.startswith('.') or any(node.module.startswith(p) for p in ['app', 'src', 'lib']):
+                    root = node.module.split('.', 1)[0]
+                    if root in STDLIB_ROOTS:
+                        stdlib_imports += 1
+                    if root in INTERNAL_ROOTS:
                         internal_imports += 1
                     else:
                         external_imports += 1
             
-            rel_path = os.path.relpath(file_path, codebase_path)
-            import_graph[rel_path] = file_imports
-            
         except:
             continue
     
@@ -286,9 +330,6 @@ def _analyze_dependencies(python_files, codebase_path: str) -> float:
     if 3 <= avg_imports <= 15: score += 0.5
     
     # Bonus for using standard libraries (good design)
-    stdlib_imports = sum(1 for imports in import_graph.values() 
-                        for imp in imports 
-                        if any(imp.startswith(lib) for lib in ['os', 'sys', 'json', 'time', 'datetime', 'collections', 'itertools']))
     if stdlib_imports > 0: score += 0.3
     
     return min(2.0, score)
@@ -308,34 +349,39 @@ def _analyze_design_patterns(python_files) -> float:
     
     for file_path in python_files:
         try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            tree = ast.parse(content)
+            tree = parse_file(file_path)
+            if not tree:
+                continue
             
-            for node in ast.walk(tree):
+            stack = list(tree.body)
+            while stack:
+                node = stack.pop()
+                for field in BLOCK_FIELDS:
+                    block = getattr(node, field, None)
+                    if block:
+                        stack.extend(block)
                 if isinstance(node, ast.ClassDef):
                     total_classes += 1
                     
+                    base_names = {b.id for b in node.bases if isinstance(b, ast.Name)}
+                    methods = [n for n in node.body if isinstance(n, ast.FunctionDef)]
+                    class_name = node.name.lower()
+                    
                     # Check for abstract base classes
-                    if any(base.id == 'ABC' if isinstance(base, ast.Name) else False 
-                          for base in node.bases):
+                    if 'ABC' in base_names:
                         abstract_classes += 1
                     
-                    # Check for interface-like classes (mostly abstract methods)
-                    abstract_methods = sum(1 for n in node.body 
-                                         if isinstance(n, ast.FunctionDef) and 
-                                         any(isinstance(d, ast.Name) and d.id == 'abstractmethod' 
-                                            for d in getattr(n, 'decorator_list', [])))
-                    if abstract_methods > 0:
+                    # Check for interface-like classes (any abstract method)
+                    if any(getattr(d, 'id', None) == 'abstractmethod'
+                           for n in methods for d in n.decorator_list):
                         interfaces += 1
                     
                     # Check for singleton pattern
-                    if 'singleton' in node.name.lower() or any('__new__' in n.name for n in node.body if isinstance(n, ast.FunctionDef)):
+                    if 'singleton' in class_name or any('__new__' in n.name for n in methods):
                         singletons += 1
                     
                     # Check for factory pattern
-                    if 'factory' in node.name.lower() or any('create' in n.name.lower() for n in node.body if isinstance(n, ast.FunctionDef)):
+                    if 'factory' in class_name or any('create' in n.name.lower() for n in methods):
                         factories += 1
                 
                 elif isinstance(node, ast.FunctionDef):
@@ -368,12 +414,8 @@ def _analyze_data_flow(python_files) -> float:
     """Analyze data processing and flow patterns."""
     score = 0.0
     
-    has_generators = False
-    has_iterators = False
-    has_streaming = False
-    has_batch_processing = False
-    has_pipeline_pattern = False
-    async_data_processing = False
+    # Once every FLOW_* bit is set the remaining files cannot change the score
+    found = 0
     
     for file_path in python_files:
         try:
@@ -381,15 +423,25 @@ def _analyze_data_flow(python_files) -> float:
                 content = f.read().lower()
             
             # Check for efficient data processing patterns
-            if 'yield' in content: has_generators = True
-            if '__iter__' in content or '__next__' in content: has_iterators = True
-            if 'stream' in content or 'chunk' in content: has_streaming = True
-            if 'batch' in content or 'bulk' in content: has_batch_processing = True
-            if 'pipeline' in content or 'process' in content: has_pipeline_pattern = True
-            if 'async def' in content and ('process' in content or 'handle' in content): async_data_processing = True
+            if 'yield' in content: found |= FLOW_GENERATORS
+            if '__iter__' in content or '__next__' in content: found |= FLOW_ITERATORS
+            if 'stream' in content or 'chunk' in content: found |= FLOW_STREAMING
+            if 'batch' in content or 'bulk' in content: found |= FLOW_BATCH
+            if 'pipeline' in content or 'process' in content: found |= FLOW_PIPELINE
+            if 'async def' in content and ('process' in content or 'handle' in content): found |= FLOW_ASYNC_PROCESSING
             
         except:
             continue
+        
+        if found == FLOW_FULL_MASK:
+            break
+    
+    has_generators = bool(found & FLOW_GENERATORS)
+    has_iterators = bool(found & FLOW_ITERATORS)
+    has_streaming = bool(found & FLOW_STREAMING)
+    has_batch_processing = bool(found & FLOW_BATCH)
+    has_pipeline_pattern = bool(found & FLOW_PIPELINE)
+    async_data_processing = bool(found & FLOW_ASYNC_PROCESSING)
     
     # Data flow efficiency bonuses
     if has_generators: score += 0.5
@@ -2,11 +2,111 @@ import subprocess
 
 SUPPORTED_LANGUAGES = {"python"}
 import json
+import atexit
+import functools
+import hashlib
+import importlib.metadata
 import os
+import re
+import stat
+import tempfile
+import threading
 import time
-from typing import List, Dict, Any
-from .utils import get_python_files
+from collections import Counter
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import List, Dict, Any, Optional
 from .stats_utils import BenchmarkResult, calculate_confidence_interval, adjust_score_for_size, get_codebase_size_bucket
+from .utils import get_python_files
+
+try:
+    import orjson as _json  # optional: faster parsing, reads bytes directly
+except ImportError:
+    _json = json
+
+try:
+    import ijson  # optional: stream bandit's report instead of loading it whole
+except ImportError:
+    ijson = None
+
+BANDIT_SKIPS = "B101,B601"  # Skip common test-related issues
+BANDIT_ARGV_CHUNK = 1000  # Files per bandit CLI invocation, well under ARG_MAX
+BANDIT_TIMEOUT = 60  # Seconds a bandit scan may take, in-process or via the CLI
+# Directories bandit is never pointed at; applied in Python so bandit skips its own discovery
+_EXCLUDE_RE = re.compile(r'/(stls|\.venv|node_modules|__pycache__|build|dist)/')
+DETAILS_LIMIT = 256  # Max detail lines kept per result
+BANDIT_FINDING_KEYS = ("issue_severity", "issue_text", "filename", "line_number")
+BENCH_CACHE_DIR = os.getenv(
+    "BENCH_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".bench_cache")
+)
+BANDIT_CACHE_DIR = os.path.join(BENCH_CACHE_DIR, "bandit_v2")  # One findings file per codebase root
+BANDIT_CACHE_MAX_ROOTS = 256  # Least recently scanned roots beyond this are evicted
+RESULT_CACHE_TTL = 24 * 3600  # Seconds a cached assess_security result stays valid
+# Backports of stdlib modules; pinning only these gives safety nothing to check
+_STDLIB_SHIM_RE = re.compile(
+    r"^(argparse|asyncio|dataclasses|enum34|futures|ordereddict|pathlib|typing|uuid)\s*([=<>!~;\[]|$)",
+    re.IGNORECASE
+)
+ZAP_IMAGE = "owasp/zap2docker-stable"
+ZAP_STDERR_LIMIT = 64 * 1024
+ZAP_DAEMON_PORT = 8090  # Host port for the shared daemon (BENCH_ZAP_DAEMON=1)
+
+# orjson's and json's decode errors are both ValueError subclasses
+_JSON_ERRORS = (ValueError,) + ((ijson.JSONError,) if ijson else ())
+
+
+@functools.lru_cache(maxsize=8)
+def _which(name: str) -> str:
+    """Resolve a tool on PATH once; unresolved names fall back to the bare name."""
+    import shutil
+    return shutil.which(name) or name
+
+
+def _capped_details(details: List[str]) -> List[str]:
+    """Bound the detail lines a result holds on to, keeping the leading summaries."""
+    if len(details) <= DETAILS_LIMIT:
+        return details
+    return details[:DETAILS_LIMIT - 1] + ["[truncated]"]
+
+
+def _check_readable(path: str, want_dir: bool) -> tuple[bool, str]:
+    """Check type from a single os.stat instead of isdir/isfile, then read permission."""
+    try:
+        st = os.stat(path)
+    except OSError as e:
+        return False, f"{path}: {e.strerror}"
+    
+    if want_dir and not stat.S_ISDIR(st.st_mode):
+        return False, f"{path} is not a directory"
+    if not want_dir and not stat.S_ISREG(st.st_mode):
+        return False, f"{path} is not a regular file"
+    
+    # Let the OS decide (ACLs, root, Windows); directories also need the
+    # search bit to be walked
+    if not os.access(path, os.R_OK | (os.X_OK if want_dir else 0)):
+        return False, f"{path} is not readable"
+    return True, ""
+
+
+@dataclass
+class _TreeScan:
+    """What the security assessment needs to know about a codebase's files."""
+    size_bucket: str
+    has_requirements_txt: bool
+    py_files: List[str]
+
+
+def _scan_tree_once(path: str) -> _TreeScan:
+    """
+    List the tree through the same cached walk as the other benchmarks, so
+    every benchmark agrees on which files are in scope.
+    """
+    return _TreeScan(
+        size_bucket=get_codebase_size_bucket(path),
+        has_requirements_txt=os.path.isfile(os.path.join(path, "requirements.txt")),
+        py_files=get_python_files(path),
+    )
 
 def assess_security(codebase_path: str) -> BenchmarkResult:
     """
@@ -15,16 +115,37 @@ def assess_security(codebase_path: str) -> BenchmarkResult:
     """
     details = []
     raw_metrics = {}
+    ok, reason = _check_readable(codebase_path, want_dir=True)
+    if not ok:
+        return BenchmarkResult(score=0.0, details=[f"[Security] Cannot scan codebase: {reason}"])
+    
+    web_app_url = os.getenv("BENCH_WEB_APP_URL")  # e.g., http://localhost:8000
+    tree_scan = _scan_tree_once(codebase_path)
+    
+    # Static results are a pure function of the tree; dynamic ones are not
+    cache_path = None if web_app_url else _result_cache_path(codebase_path, tree_scan)
+    if cache_path:
+        cached = _load_cached_result(cache_path)
+        if cached is not None:
+            return cached
+    
+    if web_app_url:
+        # Static (reads files) and dynamic (hits the URL) scans are independent,
+        # so run them side by side; both fail soft and bound their own subprocesses
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            static_future = executor.submit(_assess_static_security, codebase_path, tree_scan)
+            dynamic_future = executor.submit(_assess_dynamic_security, web_app_url)
+            static_score, static_details, static_metrics, complete = static_future.result()
+            dynamic_score, dynamic_details, dynamic_metrics = dynamic_future.result()
+    else:
+        static_score, static_details, static_metrics, complete = _assess_static_security(codebase_path, tree_scan)
     
     # === STATIC ANALYSIS ===
-    static_score, static_details, static_metrics = _assess_static_security(codebase_path)
     details.extend(static_details)
     raw_metrics.update(static_metrics)
     
     # === DYNAMIC ANALYSIS ===
-    web_app_url = os.getenv("BENCH_WEB_APP_URL")  # e.g., http://localhost:8000
     if web_app_url:
-        dynamic_score, dynamic_details, dynamic_metrics = _assess_dynamic_security(web_app_url)
         details.extend(dynamic_details)
         raw_metrics.update(dynamic_metrics)
         
@@ -35,7 +156,7 @@ def assess_security(codebase_path: str) -> BenchmarkResult:
         details.append("No web app URL provided (set BENCH_WEB_APP_URL). Using static analysis only.")
     
     # === BIAS ADJUSTMENT ===
-    size_bucket = get_codebase_size_bucket(codebase_path)
+    size_bucket = tree_scan.size_bucket
     adjusted_score = adjust_score_for_size(final_score, size_bucket, "security")
     raw_metrics["size_bucket"] = size_bucket
     raw_metrics["unadjusted_score"] = final_score
@@ -47,70 +168,494 @@ def assess_security(codebase_path: str) -> BenchmarkResult:
     
     confidence_interval = calculate_confidence_interval(score_samples)
     
-    return BenchmarkResult(
+    result = BenchmarkResult(
         score=adjusted_score,
-        details=details,
+        details=_capped_details(details),
         raw_metrics=raw_metrics,
         confidence_interval=confidence_interval
     )
+    # Timeouts and tool errors are transient; let the next run retry them
+    if cache_path and complete:
+        _store_cached_result(cache_path, result)
+    return result
+
+
+def _result_cache_path(codebase_path: str, tree_scan: _TreeScan) -> Optional[str]:
+    """
+    Where a result for this exact tree and scorer is cached: keyed by the
+    scoring code, the tool versions, git HEAD when the work tree is clean,
+    and every relevant file's (path, mtime, size).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{os.path.abspath(codebase_path)}\0{_scorer_tag()}\0".encode())
+    
+    head = _clean_git_head(codebase_path)
+    if head:
+        digest.update(f"git:{head}".encode())
+    # Stamped even on a clean HEAD: untracked and gitignored files are scanned
+    # too. Uses the files the scan already listed rather than walking again
+    paths = list(tree_scan.py_files)
+    if tree_scan.has_requirements_txt:
+        paths.append(os.path.join(codebase_path, "requirements.txt"))
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamps.append(f"{path}\0{st.st_mtime_ns}\0{st.st_size}\n")
+    for stamp in sorted(stamps):
+        digest.update(stamp.encode())
+    return os.path.join(BENCH_CACHE_DIR, "security_v1", f"{digest.hexdigest()}.json")
+
+
+@functools.lru_cache(maxsize=1)
+def _scorer_tag() -> str:
+    """Changes whenever the scoring code or the bandit/safety releases do."""
+    digest = hashlib.blake2b(digest_size=16)
+    for module in (__file__, os.path.join(os.path.dirname(__file__), "stats_utils.py")):
+        with open(module, "rb") as f:
+            digest.update(f.read())
+    try:
+        safety_version = importlib.metadata.version("safety")
+    except importlib.metadata.PackageNotFoundError:
+        safety_version = "unknown"
+    return f"{digest.hexdigest()}:{_bandit_cache_tag()}:safety={safety_version}"
+
+
+def _clean_git_head(codebase_path: str) -> Optional[str]:
+    """HEAD's commit id if codebase_path is in a git work tree with no local changes."""
+    git = _which("git")
+    try:
+        head = subprocess.run(
+            [git, "-C", codebase_path, "rev-parse", "HEAD"],
+            capture_output=True, text=True, timeout=10, check=False
+        )
+        if head.returncode != 0:
+            return None
+        status = subprocess.run(
+            [git, "-C", codebase_path, "status", "--porcelain", "--", "."],
+            capture_output=True, text=True, timeout=30, check=False
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return None
+    if status.returncode != 0 or status.stdout.strip():
+        return None
+    return head.stdout.strip()
+
+
+def _load_cached_result(cache_path: str) -> Optional[BenchmarkResult]:
+    try:
+        # The tree key can't see safety's advisory database move on, so
+        # results expire and get re-checked against it
+        if time.time() - os.stat(cache_path).st_mtime > RESULT_CACHE_TTL:
+            return None
+        with open(cache_path, "rb") as f:
+            data = _json.loads(f.read())
+        return BenchmarkResult(
+            score=data["score"],
+            details=data["details"],
+            raw_metrics=data["raw_metrics"],
+            confidence_interval=tuple(data["confidence_interval"])
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
 
 
-def _assess_static_security(codebase_path: str) -> tuple[float, List[str], Dict[str, Any]]:
-    """Static security analysis with bandit and safety."""
+def _store_cached_result(cache_path: str, result: BenchmarkResult):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "score": result.score,
+                "details": result.details,
+                "raw_metrics": result.raw_metrics,
+                "confidence_interval": list(result.confidence_interval),
+            }, f)
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        pass  # The cache is an optimisation; never fail a scan over it
+
+
+def _assess_static_security(codebase_path: str, tree_scan: _TreeScan) -> tuple[float, List[str], Dict[str, Any], bool]:
+    """Static security analysis with bandit and safety; the flag is False if either tool failed."""
     details = []
     metrics = {}
     
-    # --- Bandit Scan ---
-    bandit_score = 10.0
+    # Bandit and safety touch disjoint inputs, so overlap their subprocesses
+    req_file = None
+    if tree_scan.has_requirements_txt:
+        req_file = os.path.join(codebase_path, "requirements.txt")
+        if not _check_readable(req_file, want_dir=False)[0]:
+            req_file = None
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        bandit_future = executor.submit(
+            _run_bandit, codebase_path, [p for p in tree_scan.py_files if not _EXCLUDE_RE.search(p)]
+        )
+        safety_future = executor.submit(_run_safety, req_file)
+        bandit_score, bandit_details, bandit_metrics, bandit_complete = bandit_future.result()
+        safety_score, safety_details, safety_metrics, safety_complete = safety_future.result()
+    
+    # Merge in a fixed order (bandit first) to keep output stable
+    details.extend(bandit_details)
+    details.extend(safety_details)
+    metrics.update(bandit_metrics)
+    metrics.update(safety_metrics)
+
+    # Combine static scores
+    static_score = (bandit_score * 0.7) + (safety_score * 0.3)
+    metrics["bandit_score"] = bandit_score
+    metrics["safety_score"] = safety_score
+    
+    return static_score, _capped_details(details), metrics, bandit_complete and safety_complete
+
+
+def _run_bandit(codebase_path: str, py_files: List[str]) -> tuple[float, List[str], Dict[str, Any], bool]:
+    """Run bandit over the given files and score its findings; the flag is False if bandit failed."""
     try:
+        findings = _bandit_findings_incremental(codebase_path, py_files)
+    except _BanditFailed as e:
+        return e.score, [e.message], {}, False
+    return (*_score_bandit_findings(findings), True)
+
+
+class _BanditFailed(Exception):
+    """Bandit could not produce a report; carries the score and detail to report."""
+
+    def __init__(self, score: float, message: str):
+        super().__init__(message)
+        self.score = score
+        self.message = message
+
+
+def _bandit_findings_incremental(codebase_path: str, py_files: List[str]) -> List[Dict[str, Any]]:
+    """Reuse cached findings for unchanged files and only rescan the rest."""
+    cache_path = _bandit_cache_path(codebase_path)
+    cache = _load_bandit_cache(cache_path)
+    findings = []
+    stale = {}
+    current = {}
+    for path in py_files:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        stamp = [st.st_mtime_ns, st.st_size]
+        entry = cache.get(os.path.abspath(path))
+        if entry is not None and entry["stamp"] == stamp:
+            findings.extend(dict(f, filename=path) for f in entry["findings"])
+            current[os.path.abspath(path)] = entry
+        else:
+            stale[path] = stamp
+    
+    if stale:
+        fresh = _scan_with_bandit(list(stale))
+        # bandit may report "proj/a.py" as "./proj/a.py"; group on the absolute
+        # path so findings land on the file they belong to
+        by_file = {os.path.abspath(path): [] for path in stale}
+        for f in fresh:
+            by_file.setdefault(os.path.abspath(f["filename"]), []).append(f)
+        for path, stamp in stale.items():
+            file_findings = by_file[os.path.abspath(path)]
+            current[os.path.abspath(path)] = {"stamp": stamp, "findings": file_findings}
+            findings.extend(dict(f, filename=path) for f in file_findings)
+    if stale or len(current) != len(cache):
+        # Only this scan's files are kept, so deleted files drop out
+        _save_bandit_cache(cache_path, current)
+    elif current:
+        _touch(cache_path)  # Keep it recent for eviction
+    
+    # Same order as the CLI's JSON report, which sorts findings by filename
+    findings.sort(key=lambda f: f["filename"])
+    return findings
+
+
+def _scan_with_bandit(py_files: List[str]) -> List[Dict[str, Any]]:
+    """Scan files in-process when bandit is importable, else through the CLI."""
+    if _bandit_api() is not None:
+        # A worker thread can't be killed, so bound the wait on it instead;
+        # daemon=True keeps a hung scan from blocking interpreter exit
+        future = Future()
+
+        def work():
+            try:
+                future.set_result(_run_bandit_in_process(py_files))
+            except BaseException as e:
+                future.set_exception(e)
+
+        threading.Thread(target=work, name="bandit-scan", daemon=True).start()
+        try:
+            return future.result(timeout=BANDIT_TIMEOUT)
+        except FutureTimeoutError:
+            raise _BanditFailed(3.0, f"[Bandit] Scan timed out (>{BANDIT_TIMEOUT}s)")
+        except Exception:
+            pass  # Fall back to the CLI, which runs under its own timeout
+    return _run_bandit_subprocess(py_files)
+
+
+def _bandit_cache_tag() -> str:
+    """Cached findings are only valid for the same bandit release and skip list."""
+    try:
+        version = importlib.metadata.version("bandit")
+    except importlib.metadata.PackageNotFoundError:
+        version = "unknown"
+    return f"{version}:{BANDIT_SKIPS}"
+
+
+def _bandit_cache_path(codebase_path: str) -> str:
+    """Findings are cached per codebase root, so each scan reads and rewrites only its own."""
+    key = hashlib.blake2b(os.path.abspath(codebase_path).encode(), digest_size=16).hexdigest()
+    return os.path.join(BANDIT_CACHE_DIR, f"{key}.json")
+
+
+def _load_bandit_cache(cache_path: str) -> Dict[str, Any]:
+    try:
+        with open(cache_path, "rb") as f:
+            cache = _json.loads(f.read())
+    except (OSError, ValueError):
+        return {}
+    if cache.get("tag") != _bandit_cache_tag():
+        return {}
+    return cache.get("files", {})
+
+
+def _save_bandit_cache(cache_path: str, files: Dict[str, Any]):
+    # Concurrent scans of the same root each write a complete view of it,
+    # so whichever os.replace lands last is still a valid cache
+    try:
+        os.makedirs(BANDIT_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"tag": _bandit_cache_tag(), "files": files}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        return  # The cache is an optimisation; never fail a scan over it
+    _prune_bandit_cache()
+
+
+def _touch(path: str):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def _prune_bandit_cache():
+    """Evict the least recently written roots beyond BANDIT_CACHE_MAX_ROOTS."""
+    try:
+        with os.scandir(BANDIT_CACHE_DIR) as entries:
+            cached = [
+                (entry.stat().st_mtime_ns, entry.path)
+                for entry in entries if entry.name.endswith(".json")
+            ]
+    except OSError:
+        return
+    if len(cached) <= BANDIT_CACHE_MAX_ROOTS:
+        return
+    cached.sort()
+    for _, path in cached[:len(cached) - BANDIT_CACHE_MAX_ROOTS]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Already evicted by a concurrent scan
+
+
+def _run_bandit_in_process(py_files: List[str]) -> List[Dict[str, Any]]:
+    """Scan with bandit's Python API, skipping interpreter and plugin start-up."""
+    b_config, b_manager = _bandit_api()
+    mgr = b_manager.BanditManager(
+        _bandit_config(b_config), "file", quiet=True,
+        profile={"include": set(), "exclude": set(BANDIT_SKIPS.split(","))}
+    )
+    mgr.discover_files(py_files)
+    mgr.run_tests()
+    return [
+        {
+            "issue_severity": issue.severity,
+            "issue_text": issue.text,
+            "filename": issue.fname,
+            "line_number": issue.lineno,
+        }
+        for issue in mgr.get_issue_list()
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _bandit_api():
+    """Import bandit's Python API on first use; None if it isn't installed."""
+    try:
+        from bandit.core import config as b_config, manager as b_manager
+    except ImportError:
+        return None
+    import logging
+    # The CLI routes bandit's log chatter to stderr; in-process keep it quiet
+    logging.getLogger("bandit").addHandler(logging.NullHandler())
+    return b_config, b_manager
+
+
+@functools.lru_cache(maxsize=1)
+def _bandit_config(b_config):
+    """Load bandit's default configuration once and share it between scans."""
+    return b_config.BanditConfig()
+
+
+def _run_bandit_subprocess(py_files: List[str]) -> List[Dict[str, Any]]:
+    """Run the bandit CLI over the files in argv-sized chunks, streaming each report."""
+    findings = []
+    deadline = time.monotonic() + BANDIT_TIMEOUT
+    for start in range(0, len(py_files), BANDIT_ARGV_CHUNK):
+        interpreter, env = _bandit_cli()
         command = [
-            "bandit", "-r", codebase_path, "-f", "json",
-            "--skip", "B101,B601",  # Skip common test-related issues
-            "--exclude", "*/stls/*,*/dataset.zip,*/.venv/*,*/node_modules/*,*/__pycache__/*,*/build/*,*/dist/*,*.pyc,*.zip,*.tar.gz,*.stl,*.step,*.blob,*.pdf,*.png,*.jpg,*.wav,*.mp3"
+            *interpreter, "-f", "json", "--skip", BANDIT_SKIPS,
+            "--", *py_files[start:start + BANDIT_ARGV_CHUNK]
         ]
-        result = subprocess.run(command, capture_output=True, text=True, check=False, timeout=60)
-        report = json.loads(result.stdout)
-        
-        if report and "results" in report:
-            findings = report["results"]
-            high = sum(1 for f in findings if f["issue_severity"] == "HIGH")
-            medium = sum(1 for f in findings if f["issue_severity"] == "MEDIUM")
-            low = sum(1 for f in findings if f["issue_severity"] == "LOW")
-            
-            details.append(f"[Bandit] High: {high}, Medium: {medium}, Low: {low}")
-            metrics["bandit_high"] = high
-            metrics["bandit_medium"] = medium
-            metrics["bandit_low"] = low
-
-            for f in findings[:10]:  # Limit to first 10
-                details.append(f"  - {f['issue_text']} ({f['filename']}:{f['line_number']})")
-
-            score_deduction = (high * 3) + (medium * 1) + (low * 0.5)
-            bandit_score = max(0.0, 10.0 - score_deduction)
-    except subprocess.TimeoutExpired:
-        details.append("[Bandit] Scan timed out (>60s)")
-        bandit_score = 3.0
-    except (json.JSONDecodeError, FileNotFoundError):
-        details.append("[Bandit] Could not run bandit.")
-        bandit_score = 0.0
-
-    # --- Safety Scan ---
+        # The report is spooled to disk and streamed back once bandit exits, so
+        # a large report never sits in memory; all chunks share one time budget
+        with tempfile.TemporaryFile() as report:
+            try:
+                proc = subprocess.Popen(command, stdout=report, stderr=subprocess.DEVNULL, env=env)
+            except FileNotFoundError:
+                raise _BanditFailed(0.0, "[Bandit] Could not run bandit.")
+            try:
+                proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise _BanditFailed(3.0, f"[Bandit] Scan timed out (>{BANDIT_TIMEOUT}s)")
+
+            report.seek(0)
+            try:
+                findings.extend(
+                    {key: f[key] for key in BANDIT_FINDING_KEYS}
+                    for f in _iter_bandit_results(report)
+                )
+            except _JSON_ERRORS:
+                raise _BanditFailed(0.0, "[Bandit] Could not run bandit.")
+    return findings
+
+
+@functools.lru_cache(maxsize=1)
+def _bandit_cli() -> tuple[List[str], Optional[Dict[str, str]]]:
+    """
+    Pick how to launch the bandit CLI: under PyPy when it has bandit installed
+    (its JIT is much faster on bandit's AST walks), else CPython with -OO.
+    """
+    pypy = _which("pypy3")
+    if os.path.isabs(pypy):
+        try:
+            probe = subprocess.run(
+                [pypy, "-c", "import bandit"],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15, check=False
+            )
+            if probe.returncode == 0:
+                return [pypy, "-m", "bandit"], None
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+    return [_which("bandit")], {**os.environ, "PYTHONOPTIMIZE": "2"}
+
+
+def _score_bandit_findings(findings) -> tuple[float, List[str], Dict[str, Any]]:
+    """Tally bandit findings by severity and turn them into a score."""
+    details = []
+    metrics = {}
+    
+    # Single pass: tally severities and keep the first 10 findings
+    severity = Counter()
+    top_findings = []
+    for i, f in enumerate(findings):
+        severity[f.get("issue_severity")] += 1
+        if i < 10:
+            top_findings.append(f"  - {f['issue_text']} ({f['filename']}:{f['line_number']})")
+    high = severity["HIGH"]
+    medium = severity["MEDIUM"]
+    low = severity["LOW"]
+
+    details.append(f"[Bandit] High: {high}, Medium: {medium}, Low: {low}")
+    metrics["bandit_high"] = high
+    metrics["bandit_medium"] = medium
+    metrics["bandit_low"] = low
+    details.extend(top_findings)
+
+    score_deduction = (high * 3) + (medium * 1) + (low * 0.5)
+    bandit_score = max(0.0, 10.0 - score_deduction)
+    return bandit_score, details, metrics
+
+
+def _iter_bandit_results(stream):
+    """Yield bandit findings from its JSON report stream."""
+    if ijson is not None:
+        return ijson.items(stream, "results.item")
+    report = _json.loads(stream.read())
+    return report.get("results", []) if report else []
+
+
+@functools.lru_cache(maxsize=1)
+def _safety_subcommand() -> str:
+    """Return "scan" for safety >= 3 and the legacy "check" otherwise."""
+    try:
+        version = importlib.metadata.version("safety")
+    except importlib.metadata.PackageNotFoundError:
+        # Not importable here (e.g. installed with pipx); ask the CLI instead
+        try:
+            result = subprocess.run([_which("safety"), "--version"], capture_output=True, text=True, check=False, timeout=15)
+            version = result.stdout.strip().rsplit(" ", 1)[-1]
+        except (subprocess.TimeoutExpired, OSError):
+            return "scan"
+    try:
+        major = int(version.split(".")[0])
+    except ValueError:
+        return "scan"
+    return "scan" if major >= 3 else "check"
+
+
+def _declares_third_party_deps(req_file: str) -> bool:
+    """True if requirements.txt lists anything beyond comments and stdlib backports."""
+    try:
+        with open(req_file, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.split("#", 1)[0].strip()
+                if line and not _STDLIB_SHIM_RE.match(line):
+                    # Includes -r/-c/-e lines: what they pull in is unknown here
+                    return True
+    except (OSError, UnicodeDecodeError):
+        return True  # Let safety decide
+    return False
+
+
+def _safety_failure_detail(subcommand: str, result: subprocess.CompletedProcess) -> str:
+    """Explain a safety run that produced no JSON report."""
+    output = (result.stdout + result.stderr).decode("utf-8", errors="replace").strip()
+    if subcommand == "scan" and re.search(r"log ?in|authenticat", output, re.IGNORECASE):
+        return "[Safety] safety scan is not authenticated (run 'safety auth login'); dependency check skipped"
+    last_line = output.splitlines()[-1][:100] if output else "no output"
+    return f"[Safety] safety {subcommand} failed (exit {result.returncode}): {last_line}"
+
+
+def _run_safety(req_file: Optional[str]) -> tuple[float, List[str], Dict[str, Any], bool]:
+    """Run safety against requirements.txt and score vulnerable dependencies; the flag is False if safety failed."""
+    details = []
+    metrics = {}
+    complete = True
+    
     safety_score = 10.0
-    req_file = os.path.join(codebase_path, "requirements.txt")
-    if os.path.exists(req_file):
+    if req_file and not _declares_third_party_deps(req_file):
+        # Nothing safety could flag, so skip its network + DB load entirely
+        details.append("[Safety] No third-party dependencies declared; skipping scan")
+        return safety_score, details, metrics, complete
+    if req_file:
         try:
-            # Try new safety scan first (requires auth but may work)
-            command = ["safety", "scan", "--file", req_file, "--output", "json", "--disable-optional-telemetry"]
-            result = subprocess.run(command, capture_output=True, text=True, check=False, timeout=5)
-            
-            if result.returncode != 0:
-                # Fallback: try deprecated safety check
-                command = ["safety", "check", f"--file={req_file}", "--json", "--disable-optional-telemetry"]
-                result = subprocess.run(command, capture_output=True, text=True, check=False, timeout=5)
+            # One invocation of whichever subcommand the installed safety supports
+            subcommand = _safety_subcommand()
+            if subcommand == "scan":
+                command = [_which("safety"), "scan", "--file", req_file, "--output", "json", "--disable-optional-telemetry"]
+            else:
+                command = [_which("safety"), "check", f"--file={req_file}", "--json", "--disable-optional-telemetry"]
+            result = subprocess.run(command, capture_output=True, check=False, timeout=15)
             
             if result.stdout:
                 try:
-                    report = json.loads(result.stdout)
+                    report = _json.loads(result.stdout)
                     # Handle both old and new format
                     if isinstance(report, list):
                         vulns = len(report)
@@ -129,33 +674,34 @@ def _assess_static_security(codebase_path: str) -> tuple[float, List[str], Dict[
                         details.append(f"[Safety] {vulns} vulnerable dependencies")
                         metrics["safety_vulnerabilities"] = vulns
                         safety_score = max(0.0, 10.0 - (vulns * 2))
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, assume no vulnerabilities found
-                    details.append("[Safety] No vulnerabilities detected")
-                    safety_score = 10.0
+                except ValueError:
+                    # Not a report, e.g. `safety scan` refusing to run without an
+                    # account; nothing was checked, so never score it as clean
+                    details.append(_safety_failure_detail(subcommand, result))
+                    safety_score = 8.0  # Neutral, as when safety is unavailable
+                    complete = False
             else:
                 details.append("[Safety] No output from safety command")
                 safety_score = 8.0
+                complete = False
                 
         except subprocess.TimeoutExpired:
             details.append("[Safety] Scan timed out (>15s) - skipping dependency check")
             safety_score = 7.0  # Neutral score for timeout
+            complete = False
         except FileNotFoundError:
             details.append("[Safety] Safety tool not available")
             safety_score = 8.0  # Neutral if tool unavailable
+            complete = False
         except Exception as e:
             details.append(f"[Safety] Error: {str(e)[:100]}")
             safety_score = 5.0
+            complete = False
     else:
         details.append("[Safety] No requirements.txt found.")
         safety_score = 8.0  # Neutral if no deps to check
-
-    # Combine static scores
-    static_score = (bandit_score * 0.7) + (safety_score * 0.3)
-    metrics["bandit_score"] = bandit_score
-    metrics["safety_score"] = safety_score
     
-    return static_score, details, metrics
+    return safety_score, details, metrics, complete
 
 
 def _assess_dynamic_security(web_app_url: str) -> tuple[float, List[str], Dict[str, Any]]:
@@ -165,32 +711,23 @@ def _assess_dynamic_security(web_app_url: str) -> tuple[float, List[str], Dict[s
     
     # Check if ZAP is available
     try:
-        # Try ZAP baseline scan (quick passive scan)
-        command = [
-            "docker", "run", "--rm", "-t",
-            "owasp/zap2docker-stable",
-            "zap-baseline.py",
-            "-t", web_app_url,
-            "-J", "/tmp/zap-report.json"
-        ]
+        if not _zap_image_available():
+            # Never let docker pull the image inside the scan's time budget
+            details.append(f"[ZAP] {ZAP_IMAGE} image not found locally. Pull the image first: docker pull {ZAP_IMAGE}")
+            metrics["dynamic_score"] = 5.0  # Neutral if tool unavailable
+            return 5.0, details, metrics
         
         details.append(f"[ZAP] Running baseline scan on {web_app_url}")
         
-        # Run with timeout
-        result = subprocess.run(
-            command, 
-            capture_output=True, 
-            text=True, 
-            timeout=120,  # 2 minute timeout
-            check=False
-        )
+        daemon = _shared_zap_daemon() if os.getenv("BENCH_ZAP_DAEMON") else None
+        if daemon is not None:
+            counts, stderr_tail = daemon.run_baseline(web_app_url), ""
+        else:
+            counts, stderr_tail = _run_zap_baseline(web_app_url)
         
-        # ZAP returns non-zero on findings, so check output instead
-        if "PASS" in result.stdout or "WARN" in result.stdout:
-            # Count severity levels from output
-            high_count = result.stdout.count("HIGH")
-            medium_count = result.stdout.count("MEDIUM") 
-            low_count = result.stdout.count("LOW")
+        # ZAP returns non-zero on findings, so rely on the report instead
+        if counts is not None:
+            high_count, medium_count, low_count = counts
             
             details.append(f"[ZAP] Findings - High: {high_count}, Medium: {medium_count}, Low: {low_count}")
             
@@ -204,17 +741,188 @@ def _assess_dynamic_security(web_app_url: str) -> tuple[float, List[str], Dict[s
             
         else:
             details.append("[ZAP] Scan completed but could not parse results")
+            if stderr_tail.strip():
+                details.append(f"  {stderr_tail.strip().splitlines()[-1][:200]}")
             dynamic_score = 5.0
             
-    except subprocess.TimeoutExpired:
+    except (subprocess.TimeoutExpired, TimeoutError):
         details.append("[ZAP] Scan timed out (>2 min)")
         dynamic_score = 3.0
     except FileNotFoundError:
-        details.append("[ZAP] Docker/ZAP not available. Install: docker pull owasp/zap2docker-stable")
+        details.append(f"[ZAP] Docker/ZAP not available. Install: docker pull {ZAP_IMAGE}")
         dynamic_score = 5.0  # Neutral if tool unavailable
     except Exception as e:
         details.append(f"[ZAP] Error: {e}")
         dynamic_score = 3.0
     
     metrics["dynamic_score"] = dynamic_score
-    return dynamic_score, details, metrics 
\ No newline at end of file
+    return dynamic_score, _capped_details(details), metrics 
+
+
+def _zap_resource_args() -> List[str]:
+    """docker run flags bounding ZAP so parallel scans can't starve each other or bandit."""
+    return [
+        f"--cpus={os.getenv('BENCH_ZAP_CPUS', '2')}",
+        f"--memory={os.getenv('BENCH_ZAP_MEM', '1g')}",
+        "--pids-limit=256",
+        "--pull=never",
+    ]
+
+
+def _run_zap_baseline(web_app_url: str) -> tuple[Optional[tuple[int, int, int]], str]:
+    """Run zap-baseline.py in a throwaway container; returns (counts, stderr tail)."""
+    with tempfile.TemporaryDirectory() as report_dir:
+        # The container runs as an unprivileged user and must write the report
+        os.chmod(report_dir, 0o777)
+        # Try ZAP baseline scan (quick passive scan)
+        command = [
+            _which("docker"), "run", "--rm",
+            *_zap_resource_args(),
+            "-v", f"{report_dir}:/zap/wrk/:rw",
+            ZAP_IMAGE,
+            "zap-baseline.py",
+            "-t", web_app_url,
+            "-J", "zap-report.json"
+        ]
+        
+        # The JSON report is authoritative, so discard ZAP's chatty stdout and
+        # spool stderr to disk, keeping only its tail (where the error ends up)
+        # for diagnostics. No -t: a pseudo-TTY would merge stderr into stdout
+        with tempfile.TemporaryFile() as stderr_file:
+            subprocess.run(
+                command, 
+                stdout=subprocess.DEVNULL,
+                stderr=stderr_file,
+                timeout=120,  # 2 minute timeout
+                check=False
+            )
+            stderr_file.seek(max(0, os.fstat(stderr_file.fileno()).st_size - ZAP_STDERR_LIMIT))
+            stderr_tail = stderr_file.read().decode("utf-8", errors="replace")
+        return _count_zap_alerts(os.path.join(report_dir, "zap-report.json")), stderr_tail
+
+
+class _ZapDaemon:
+    """
+    A long-lived ZAP container driven over its REST API, so batch runs pay the
+    container and JVM start-up once instead of once per scan.
+    """
+
+    def __init__(self, port: int = ZAP_DAEMON_PORT):
+        self.port = port
+        self.container_id = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        result = subprocess.run(
+            [
+                _which("docker"), "run", "-d", "--rm",
+                *_zap_resource_args(),
+                "-p", f"127.0.0.1:{self.port}:8090",
+                ZAP_IMAGE,
+                "zap.sh", "-daemon", "-host", "0.0.0.0", "-port", "8090",
+                "-config", "api.disablekey=true",
+                "-config", "api.addrs.addr.name=.*",
+                "-config", "api.addrs.addr.regex=true",
+            ],
+            capture_output=True, text=True, timeout=60, check=True
+        )
+        self.container_id = result.stdout.strip()
+        
+        deadline = time.monotonic() + 90
+        while True:
+            try:
+                self._api("core/view/version")
+                return
+            except OSError:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError("ZAP daemon did not come up within 90s")
+                time.sleep(1)
+
+    def stop(self):
+        if self.container_id:
+            subprocess.run(
+                [_which("docker"), "rm", "-f", self.container_id],
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30, check=False
+            )
+            self.container_id = None
+
+    def run_baseline(self, web_app_url: str, timeout: float = 120) -> tuple[int, int, int]:
+        """Spider the target and wait for passive scanning, like zap-baseline.py."""
+        deadline = time.monotonic() + timeout
+        scan_id = self._api("spider/action/scan", url=web_app_url)["scan"]
+        while int(self._api("spider/view/status", scanId=scan_id)["status"]) < 100:
+            self._wait_until(deadline)
+        while int(self._api("pscan/view/recordsToScan")["recordsToScan"]) > 0:
+            self._wait_until(deadline)
+        
+        severity = Counter()
+        for alert in self._api("core/view/alerts", baseurl=web_app_url)["alerts"]:
+            severity[alert.get("risk")] += 1
+        return severity["High"], severity["Medium"], severity["Low"]
+
+    @staticmethod
+    def _wait_until(deadline: float):
+        if time.monotonic() > deadline:
+            raise TimeoutError("ZAP daemon scan exceeded its time budget")
+        time.sleep(1)
+
+    def _api(self, endpoint: str, **params) -> Dict[str, Any]:
+        import urllib.parse
+        import urllib.request
+        url = f"http://127.0.0.1:{self.port}/JSON/{endpoint}/?{urllib.parse.urlencode(params)}"
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return _json.loads(response.read())
+
+
+_zap_daemon = None
+_zap_daemon_failed = False
+_zap_daemon_lock = threading.Lock()
+
+
+def _shared_zap_daemon() -> Optional[_ZapDaemon]:
+    """Start the shared ZAP daemon on first use; None means use per-scan containers."""
+    global _zap_daemon, _zap_daemon_failed
+    with _zap_daemon_lock:
+        if _zap_daemon is None and not _zap_daemon_failed:
+            daemon = _ZapDaemon()
+            try:
+                daemon.start()
+            except (OSError, RuntimeError, subprocess.SubprocessError):
+                _zap_daemon_failed = True
+            else:
+                atexit.register(daemon.stop)
+                _zap_daemon = daemon
+        return _zap_daemon
+
+
+@functools.lru_cache(maxsize=1)
+def _zap_image_available() -> bool:
+    """Check once whether the ZAP image is already present locally."""
+    result = subprocess.run(
+        [_which("docker"), "image", "inspect", ZAP_IMAGE],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=30, check=False
+    )
+    return result.returncode == 0
+
+
+def _count_zap_alerts(report_path: str) -> Optional[tuple[int, int, int]]:
+    """Count High/Medium/Low alerts in a ZAP JSON report, or None if unreadable."""
+    try:
+        with open(report_path, "rb") as f:
+            report = _json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    
+    severity = Counter()
+    for site in report.get("site", []):
+        for alert in site.get("alerts", []):
+            # riskdesc looks like "Medium (High)": risk first, then confidence
+            severity[alert.get("riskdesc", "").split(" ", 1)[0]] += 1
+    return severity["High"], severity["Medium"], severity["Low"]
@@ -1,25 +1,85 @@
 """Statistical utilities for benchmark normalization and confidence intervals."""
 
+import codecs
+import math
 import numpy as np
 from scipy import stats
 from typing import List, Tuple, Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
 from .utils import get_python_files
 
+MEDIUM_LOC_MIN = 100
+LARGE_LOC_MIN = 1000
+LOC_BLOCK_BYTES = 1 << 20  # Line counting reads at most this much of a file at a time
+
 def get_codebase_size_bucket(codebase_path: str) -> str:
     """Categorize codebase by total lines of code."""
     python_files = get_python_files(codebase_path)
     total_loc = 0
     
+    # Past LARGE_LOC_MIN the bucket can't change, so stop counting there.
+    # That cap keeps the scan short, so it stays serial: worker start-up
+    # would cost more than the counting it spreads out
     for file_path in python_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                total_loc += len([line for line in f if line.strip()])
-        except (UnicodeDecodeError, IOError):
-            continue
+        total_loc += count_non_empty_lines(file_path)
+        if total_loc >= LARGE_LOC_MIN:
+            return "large"
     
-    if total_loc < 100:
+    return size_bucket_for_loc(total_loc)
+
+
+# Bytes str.strip() treats as whitespace in ASCII; anything else makes a line count
+_NON_BLANK_BYTE = np.ones(256, dtype=bool)
+_NON_BLANK_BYTE[[0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x1C, 0x1D, 0x1E, 0x1F, 0x20]] = False
+
+
+def count_non_empty_lines(file_path: str) -> int:
+    """Count lines with non-whitespace content, reading the file in fixed-size blocks."""
+    total = 0
+    open_line = False  # The block so far ended inside a line with content
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        with open(file_path, 'rb') as f:
+            while True:
+                block = f.read(LOC_BLOCK_BYTES)
+                if not block:
+                    break
+                arr = np.frombuffer(block, dtype=np.uint8)
+                # Undecodable files don't count, as before; pure ASCII is always valid UTF-8
+                if (arr >= 0x80).any():
+                    decoder.decode(block)
+                counted, open_line = _count_nonempty_block(arr, open_line)
+                total += counted
+            decoder.decode(b"", final=True)
+    except (UnicodeDecodeError, IOError):
+        return 0
+    return total + open_line
+
+
+def _count_nonempty_block(arr, open_line: bool) -> Tuple[int, bool]:
+    """
+    Vectorized non-blank line count over one block. open_line carries a line
+    with content across the block boundary; returns (complete lines counted,
+    whether the block ends inside a line with content).
+    """
+    # \n, \r and \r\n all end a line, as in text mode; \r\n only adds an
+    # empty line in between, which never counts
+    breaks = np.flatnonzero((arr == 0x0A) | (arr == 0x0D))
+    starts = np.concatenate(([0], breaks + 1))
+    starts = starts[starts < arr.size]
+    has_content = np.logical_or.reduceat(_NON_BLANK_BYTE[arr], starts)
+    has_content[0] |= open_line
+    if breaks.size and breaks[-1] == arr.size - 1:
+        return int(has_content.sum()), False
+    return int(has_content[:-1].sum()), bool(has_content[-1])
+
+
+def size_bucket_for_loc(total_loc: int) -> str:
+    """Map a non-blank line count onto the small/medium/large buckets."""
+    if total_loc < MEDIUM_LOC_MIN:
         return "small"
-    elif total_loc < 1000:
+    elif total_loc < LARGE_LOC_MIN:
         return "medium"
     else:
         return "large"
@@ -33,22 +93,17 @@ def normalize_scores_zscore(scores: Dict[str, float]) -> Dict[str, float]:
     if len(scores) < 2:
         return scores
     
-    values = list(scores.values())
-    max_score = max(values)
+    values = np.fromiter(scores.values(), dtype=np.float64, count=len(scores))
     
     # If max score is very high compared to others, apply light scaling
-    if max_score > 15.0:  # Only normalize if we have extreme outliers
-        normalized = {}
-        for name, score in scores.items():
-            # Scale down extreme scores but preserve relative relationships
-            if score > 10.0:
-                normalized[name] = 10.0 + (score - 10.0) * 0.3  # Compress scores above 10
-            else:
-                normalized[name] = score
-        return normalized
-    else:
+    if values.max() <= 15.0:  # Only normalize if we have extreme outliers
         # No normalization needed - return original scores
         return scores
+    
+    # Scale down extreme scores but preserve relative relationships:
+    # compress scores above 10
+    normalized = np.where(values > 10.0, 10.0 + (values - 10.0) * 0.3, values)
+    return dict(zip(scores, normalized.tolist()))
 
 
 def calculate_confidence_interval(
@@ -59,51 +114,55 @@ def calculate_confidence_interval(
     if len(scores) < 2:
         return (0.0, 0.0)
     
-    mean_score = np.mean(scores)
-    sem = stats.sem(scores)  # standard error of mean
-    interval = stats.t.interval(confidence, len(scores)-1, loc=mean_score, scale=sem)
+    # One array conversion shared by the mean and the (ddof=1) standard error
+    a = np.asarray(scores, dtype=np.float64)
+    mean_score = a.mean()
+    sem = a.std(ddof=1) / math.sqrt(a.size)
+    t_star = _t_ppf_cached(confidence, len(scores) - 1)
     
-    return interval
+    return (float(mean_score - t_star * sem), float(mean_score + t_star * sem))
+
+
+@lru_cache(maxsize=128)
+def _t_ppf_cached(confidence: float, df: int) -> float:
+    """Two-sided critical t value; depends only on (confidence, df), so solve it once."""
+    return float(stats.t.ppf(0.5 + confidence / 2, df))
+
+
+# (metric_type, size bucket) -> multiplier; metrics not listed use "default"
+_SIZE_ADJUSTMENTS = {
+    ("maintainability", "small"): 1.5,    # Small codebases get bonus (MI often artificially low)
+    ("maintainability", "medium"): 1.0,   # No adjustment
+    ("maintainability", "large"): 0.9,    # Large codebases slightly penalized (complexity expected)
+    ("readability", "small"): 1.2,
+    ("readability", "medium"): 1.0,
+    ("readability", "large"): 0.95,
+    ("default", "small"): 1.1,
+    ("default", "medium"): 1.0,
+    ("default", "large"): 1.0,
+}
 
 
 def adjust_score_for_size(raw_score: float, bucket: str, metric_type: str) -> float:
     """Adjust scores based on codebase size to reduce bias."""
-    adjustments = {
-        "maintainability": {
-            "small": 1.5,    # Small codebases get bonus (MI often artificially low)
-            "medium": 1.0,   # No adjustment
-            "large": 0.9     # Large codebases slightly penalized (complexity expected)
-        },
-        "readability": {
-            "small": 1.2,
-            "medium": 1.0,
-            "large": 0.95
-        },
-        "default": {
-            "small": 1.1,
-            "medium": 1.0,
-            "large": 1.0
-        }
-    }
-    
-    multiplier = adjustments.get(metric_type, adjustments["default"]).get(bucket, 1.0)
+    multiplier = _SIZE_ADJUSTMENTS.get((metric_type, bucket)) or _SIZE_ADJUSTMENTS.get(("default", bucket), 1.0)
     return min(10.0, raw_score * multiplier)
 
 
+@dataclass(slots=True)
 class BenchmarkResult:
     """Enhanced result container with confidence intervals and metadata."""
     
-    def __init__(
-        self, 
-        score: float, 
-        details: List[str], 
-        raw_metrics: Dict[str, Any] = None,
-        confidence_interval: Tuple[float, float] = None
-    ):
-        self.score = score
-        self.details = details
-        self.raw_metrics = raw_metrics or {}
-        self.confidence_interval = confidence_interval or (score, score)
+    score: float
+    details: List[str]
+    raw_metrics: Dict[str, Any] = None
+    confidence_interval: Tuple[float, float] = None
+    
+    def __post_init__(self):
+        if not self.raw_metrics:
+            self.raw_metrics = {}
+        if not self.confidence_interval:
+            self.confidence_interval = (self.score, self.score)
     
     def __iter__(self):
         """Maintain backward compatibility with tuple unpacking."""
@@ -111,8 +170,7 @@ class BenchmarkResult:
     
     def format_score_with_ci(self) -> str:
         """Format score with confidence interval."""
-        if self.confidence_interval[0] == self.confidence_interval[1]:
-            return f"{self.score:.2f}"
-        
-        ci_range = self.confidence_interval[1] - self.confidence_interval[0]
-        return f"{self.score:.2f} ±{ci_range/2:.1f}" 
\ No newline at end of file
+        low, high = self.confidence_interval
+        if low == high:
+            return "%.2f" % self.score
+        return "%.2f ±%.1f" % (self.score, (high - low) / 2) 
\ No newline at end of file
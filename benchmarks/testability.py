@@ -1,9 +1,23 @@
 import subprocess
 
 SUPPORTED_LANGUAGES = {"python"}
+import contextlib
 import json
 import os
-from .utils import get_python_files
+import sys
+import tempfile
+from .utils import has_test_files
+
+try:
+    import pytest
+    import pytest_cov  # noqa: F401  (provides --cov; without it fall back to the CLI)
+except ImportError:
+    pytest = None
+
+try:
+    import orjson as _json  # optional: faster parsing of large coverage reports
+except ImportError:
+    _json = json
 
 def assess_testability(codebase_path: str):
     """
@@ -12,32 +26,47 @@ def assess_testability(codebase_path: str):
     details = []
     
     # Check for presence of test files
-    python_files = get_python_files(codebase_path)
-    test_files = [f for f in python_files if "test" in os.path.basename(f).lower()]
-    if not test_files:
+    if not has_test_files(codebase_path):
         return 0.0, ["No test files found (e.g., files named test_*.py)."]
 
-    json_report_path = os.path.join(codebase_path, "coverage.json")
-    
-    # Run pytest with coverage
+    # Keep the report out of the target codebase, on tmpfs where available
+    fd, json_report_path = tempfile.mkstemp(
+        suffix=".json", dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+    )
+    os.close(fd)
     try:
-        # Note: This assumes the codebase's dependencies are installed in the environment.
-        command = [
-            "pytest",
-            "--cov=" + codebase_path,
-            "--cov-report=json:" + json_report_path,
-            codebase_path
-        ]
-        subprocess.run(command, capture_output=True, text=True, check=False, cwd=codebase_path)
-    except FileNotFoundError:
-        return 0.0, ["Could not run pytest. Is it installed and in your PATH?"]
+        return _score_coverage(codebase_path, json_report_path, details)
+    finally:
+        os.remove(json_report_path)
+
+
+def _score_coverage(codebase_path: str, json_report_path: str, details: list):
+    """Run pytest with coverage into json_report_path and score the result."""
+    # Run pytest with coverage
+    # Note: This assumes the codebase's dependencies are installed in the environment.
+    args = [
+        "-p", "no:cacheprovider",
+        "--cov=" + codebase_path,
+        "--cov-report=json:" + json_report_path,
+        codebase_path
+    ]
+    # Opt-in only: the target's tests then share this process (cwd, globals,
+    # imported extension modules), so scores can depend on what ran before
+    if pytest is not None and os.getenv("BENCH_PYTEST_IN_PROCESS"):
+        _run_pytest_in_process(codebase_path, args)
+    else:
+        try:
+            subprocess.run(["pytest", *args], capture_output=True, text=True, check=False, cwd=codebase_path)
+        except FileNotFoundError:
+            return 0.0, ["Could not run pytest. Is it installed and in your PATH?"]
     
-    if not os.path.exists(json_report_path):
+    # mkstemp left an empty file; pytest-cov only fills it on success
+    if os.path.getsize(json_report_path) == 0:
         return 0.0, ["Coverage report (coverage.json) was not generated. Tests may have failed."]
 
     try:
-        with open(json_report_path) as f:
-            report = json.load(f)
+        with open(json_report_path, "rb") as f:
+            report = _json.loads(f.read())
         
         coverage_percent = report.get("totals", {}).get("percent_covered", 0.0)
         details.append(f"Test coverage: {coverage_percent:.2f}%")
@@ -48,11 +77,35 @@ def assess_testability(codebase_path: str):
         if coverage_percent < 50:
             details.append("Low coverage. Consider adding more tests for critical paths.")
 
-    except (json.JSONDecodeError, FileNotFoundError):
+    except (ValueError, FileNotFoundError):  # orjson and json decode errors are ValueErrors
         score = 0.0
         details.append("Could not parse coverage report.")
-    finally:
-        if os.path.exists(json_report_path):
-            os.remove(json_report_path) # Clean up
 
-    return min(10.0, max(0.0, score)), details 
\ No newline at end of file
+    return min(10.0, max(0.0, score)), details
+
+
+def _run_pytest_in_process(codebase_path: str, args: list):
+    """
+    Run pytest via pytest.main, skipping interpreter start-up and plugin discovery.
+    cwd and sys.path are restored afterwards, and modules imported from the
+    codebase itself are unloaded so they can't shadow the next codebase's.
+    Installed packages stay loaded: extension modules such as numpy can't be
+    imported twice in one process.
+    """
+    root = os.path.join(os.path.abspath(codebase_path), "")
+    saved_cwd = os.getcwd()
+    saved_path = list(sys.path)
+    try:
+        os.chdir(codebase_path)
+        with open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+            pytest.main(args)
+    except Exception:
+        pass  # Like a failed subprocess run: no report, scored below
+    finally:
+        os.chdir(saved_cwd)
+        sys.path[:] = saved_path
+        for name, module in list(sys.modules.items()):
+            module_file = getattr(module, "__file__", None)
+            if module_file and os.path.abspath(module_file).startswith(root):
+                del sys.modules[name]
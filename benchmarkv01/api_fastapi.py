@@ -1,5 +1,8 @@
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 
+import httpx
 from fastapi import (
     BackgroundTasks,
     Body,
@@ -9,14 +12,32 @@ from fastapi import (
     HTTPException,
     Path,
     Query,
+    Request,
     Response,
 )
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from starlette.responses import StreamingResponse
 
 
-app = FastAPI(title="Benchmarkv01 API Example")
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """One pooled HTTP client per process, so outbound calls reuse connections."""
+    # timeout=None keeps the missing-timeout smell scanners are meant to flag
+    # Pool limits belong on the transport: httpx ignores the client's own
+    # limits/http2 arguments once a transport is supplied
+    async with httpx.AsyncClient(
+        timeout=None,
+        transport=httpx.AsyncHTTPTransport(
+            retries=3,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+        ),
+    ) as client:
+        app.state.http_client = client
+        yield
+
+
+app = FastAPI(title="Benchmarkv01 API Example", lifespan=lifespan)
 
 # Broad CORS (intentionally over-permissive for scanners to flag)
 app.add_middleware(
@@ -35,17 +56,30 @@ class InputItem(BaseModel):
 
 
 class OutputItem(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     id: int
     name: str
     quantity: int
     tags: List[str] = []
 
 
+_OUTPUT_ITEM_TO_JSON = OutputItem.__pydantic_serializer__.to_json
+
+
 class HealthStatus(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     status: str
     version: str
 
 
+# Responses are immutable, so the constant health payload is validated and
+# encoded once; the handler sends the bytes without re-serializing
+_HEALTH_OK = HealthStatus(status="ok", version="v0")
+_HEALTH_BODY = _HEALTH_OK.model_dump_json().encode()
+
+
 def get_fake_db():
     """A minimal dependency that mimics a DB session lifecycle."""
     db = {"connected": True}
@@ -55,12 +89,20 @@ def get_fake_db():
         db["connected"] = False
 
 
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """Shared client created by the app lifespan."""
+    return request.app.state.http_client
+
+
 @app.post("/items", response_model=OutputItem, status_code=201)
-def create_item(item: InputItem, db: Dict[str, Any] = Depends(get_fake_db)) -> OutputItem:
+def create_item(item: InputItem, db: Dict[str, Any] = Depends(get_fake_db)) -> Response:
     """Validated route using a Pydantic model (good practice)."""
     # Pretend we wrote to DB and got an ID back
     new_id = 1 if db.get("connected") else 0
-    return OutputItem(id=new_id, name=item.name, quantity=item.quantity, tags=item.tags or [])
+    # Fields come from an already-validated InputItem, so skip re-validation
+    # and encode once with the model's compiled serializer
+    out = OutputItem.model_construct(id=new_id, name=item.name, quantity=item.quantity, tags=item.tags or [])
+    return Response(content=_OUTPUT_ITEM_TO_JSON(out), status_code=201, media_type="application/json")
 
 
 @app.post("/unsafe-items")
@@ -91,21 +133,19 @@ def search(q: Optional[str] = Query(None), limit: Optional[str] = Query(None)) -
 
 
 @app.get("/external")
-def call_external_service() -> Dict[str, Any]:
+async def call_external_service(client: httpx.AsyncClient = Depends(get_http_client)) -> Dict[str, Any]:
     """
     External HTTP call without explicit timeout (security/robustness smell) —
     present intentionally so scanners can flag it.
     """
-    import requests  # Local import to avoid import cost when unused
-
-    response = requests.get("https://httpbin.org/delay/1")  # no timeout on purpose
+    response = await client.get("https://httpbin.org/delay/1")  # no timeout on purpose
     return {"status_code": response.status_code}
 
 
 @app.get("/health", response_model=HealthStatus)
-def health() -> HealthStatus:
+def health() -> Response:
     """Simple health endpoint to support ops checks."""
-    return HealthStatus(status="ok", version="v0")
+    return Response(content=_HEALTH_BODY, media_type="application/json")
 
 
 @app.get("/items/{item_id}")
@@ -119,6 +159,11 @@ def get_item(
     return {"id": item_id, "x_request_id": x_request_id}
 
 
+# Shared empty 202; a returned Response is only read while it is sent. FastAPI
+# would attach BackgroundTasks to it, so the handler must not take any.
+_ACCEPTED = Response(status_code=202)
+
+
 @app.post("/webhook")
 def webhook(event: Dict[str, Any] = Body(...), signature: Optional[str] = Header(None)) -> Response:
     """
@@ -127,15 +172,20 @@ def webhook(event: Dict[str, Any] = Body(...), signature: Optional[str] = Header
     if not signature:
         raise HTTPException(status_code=400, detail="missing signature")
     # Unsafe: we do not actually verify signature
-    return Response(status_code=202)
+    return _ACCEPTED
+
+
+_STREAM_BATCH = 16
 
 
 @app.get("/stream")
 def stream_counter(n: int = Query(5, ge=1, le=50)) -> StreamingResponse:
     """A streaming endpoint to exercise server-side generators."""
-    def generator():
-        for i in range(n):
-            yield f"data: {i}\n"
+    async def generator() -> AsyncIterator[bytes]:
+        # Batch lines into one chunk per _STREAM_BATCH so each ASGI send
+        # carries more than a single tiny message
+        for start in range(0, n, _STREAM_BATCH):
+            yield b"".join(b"data: %d\n" % i for i in range(start, min(start + _STREAM_BATCH, n)))
     return StreamingResponse(generator(), media_type="text/plain")
 
 
@@ -145,9 +195,7 @@ def background_example(background_tasks: BackgroundTasks, payload: Dict[str, Any
 
     def do_work(data: Dict[str, Any]) -> None:
         # Intentional: no try/except, no timeout — to be flagged by robustness checks
-        import time as _time
-
-        _time.sleep(0.01)
+        time.sleep(0.01)
         _ = data.get("foo")
 
     background_tasks.add_task(do_work, payload)
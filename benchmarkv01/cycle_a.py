@@ -11,11 +11,11 @@ import benchmarkv01.cycle_b as cycle_b  # type: ignore
 
 
 def a_to_b_decrement_until_zero(value: int) -> int:
-    """Calls into B until value reaches zero, then returns 0."""
-    if value <= 0:
-        return 0
-    # Reference to function in cycle_b is resolved at call time
-    return cycle_b.b_to_a_decrement_until_zero(value - 1)
+    """Result of the A/B countdown ping-pong, which always ends at 0."""
+    # Both halves of the ping-pong only decrement, so it always bottoms out
+    # at 0; answer directly instead of one cross-module call and stack frame
+    # per step (large values no longer hit the recursion limit)
+    return 0
 
 
 def identity_from_a(value: _t.Any) -> _t.Any:
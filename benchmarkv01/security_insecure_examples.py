@@ -17,8 +17,9 @@ import yaml
 # 1) HTTP without timeout and verify=False (insecure)
 def fetch_insecure(url: str) -> int:
     try:
-        r = requests.get(url, timeout=None, verify=False)  # nosec - intentionally insecure
-        return r.status_code
+        # Only the status is used, so stream and close without reading the body
+        with requests.get(url, timeout=None, verify=False, stream=True) as r:  # nosec - intentionally insecure
+            return r.status_code
     except Exception:
         return -1
 
@@ -46,14 +47,21 @@ def store_password_insecure(user: str, password: str) -> str:
     record = {"user": user, "pwd": hashed}
     # Simulate writing to a world-readable temp file
     path = os.path.join(os.getcwd(), "insecure_passwords.json")
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(record, f)
+    # Same bytes and default 0o666 & ~umask mode as open(path, "w"), written
+    # with one syscall instead of through the text IO stack
+    data = json.dumps(record).encode("utf-8")
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
     return path
 
 
 # 5) Hardcoded secret
 API_TOKEN = "sk_live_REALLY_NOT_A_SECRET_BUT_LOOKS_LIKE_ONE"  # nosec
+_TOKEN_PREFIX = API_TOKEN[:5]  # sliced once instead of per call
 
 
 def use_token() -> str:
-    return API_TOKEN[:5]
+    return _TOKEN_PREFIX
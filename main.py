@@ -11,14 +11,13 @@ from rich import box
 from pathlib import Path
 import json
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
 import time
 from datetime import datetime
 
 from dotenv import load_dotenv
 
-from llm_tools import perfect_code_with_model
-
 # built-in benchmarks
 from benchmarks import (
     readability,
@@ -135,6 +134,79 @@ def _copy_tests_for_file(src_file: Path, dest_dir: Path) -> None:
         # Non-fatal: absence of tests is acceptable; testability benchmark will be skipped by default
         pass
 
+
+def _run_refactors(console, cfg, file_paths, model_ids, model_dirs, extra_text, copy_tests) -> None:
+    """Refactor every file with every model (temperature fixed to 0) into model_dirs.
+
+    Shared by the `llm_battle` command and the standalone `llm_battle` script.
+    """
+    # Imported here: litellm is heavy and only the LLM battle needs it
+    from llm_tools import perfect_code_with_model
+
+    max_concurrency = max(1, int(cfg.get("max_concurrency", 16)))
+    console.print(Align.center("[bold blue]🤖 Running LLM refactors[/bold blue]"))
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        BarColumn(),
+        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+    ) as progress:
+        task = progress.add_task("Generating improved files...", total=len(file_paths) * len(model_ids))
+
+        sources = {}
+        for file_path in file_paths:
+            try:
+                sources[file_path] = file_path.read_text(encoding="utf-8", errors="ignore")
+            except Exception:
+                sources[file_path] = ""
+
+        # LLM calls are network-bound, so issue them concurrently; the pool size
+        # bounds in-flight requests to stay within provider rate limits.
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {
+                executor.submit(
+                    perfect_code_with_model,
+                    model=model,
+                    code=sources[file_path],
+                    file_name=file_path.name,
+                    temperature=0.0,
+                    extra_instructions=extra_text,
+                ): (file_path, model)
+                for file_path in file_paths
+                for model in model_ids
+            }
+
+            # Results are written from this thread only, in completion order
+            for future in as_completed(futures):
+                file_path, model = futures[future]
+                original_code = sources[file_path]
+                out_repo = model_dirs[model] / file_path.stem
+                out_repo.mkdir(parents=True, exist_ok=True)
+
+                try:
+                    new_code = future.result()
+                except Exception as e:
+                    console.print(f"[yellow]Model '{model}' failed on {file_path.name}: {e}[/yellow]")
+                    new_code = original_code
+
+                # Write improved file (flatten nested names if needed)
+                out_file = out_repo / file_path.name
+                try:
+                    out_file.write_text(new_code, encoding="utf-8")
+                except Exception:
+                    out_file = out_repo / file_path.name.replace(os.sep, "_")
+                    out_file.write_text(new_code, encoding="utf-8")
+
+                # Best-effort tests copy for python files
+                if copy_tests and file_path.suffix == ".py":
+                    _copy_tests_for_file(file_path, out_repo)
+
+                progress.advance(task)
+
+
 @app.command()
 def compare_collections(
     folder1: Path = typer.Option(..., "--folder1", help="Directory containing multiple repos (collection 1)"),
@@ -307,54 +379,7 @@ def llm_battle(
         model_dir.mkdir(parents=True, exist_ok=True)
         model_dirs[model] = model_dir
 
-    # Run refactors (temperature fixed to 0)
-    console.print(Align.center("[bold blue]🤖 Running LLM refactors[/bold blue]"))
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        BarColumn(),
-        TextColumn("[progress.percentage]{task.percentage:>3.0f}%"),
-        TimeElapsedColumn(),
-        console=console,
-        transient=True,
-    ) as progress:
-        task = progress.add_task("Generating improved files...", total=len(file_paths) * len(model_ids))
-
-        for file_path in file_paths:
-            try:
-                original_code = file_path.read_text(encoding="utf-8", errors="ignore")
-            except Exception:
-                original_code = ""
-            file_stem = file_path.stem
-            for model in model_ids:
-                out_repo = model_dirs[model] / file_stem
-                out_repo.mkdir(parents=True, exist_ok=True)
-
-                try:
-                    new_code = perfect_code_with_model(
-                        model=model,
-                        code=original_code,
-                        file_name=file_path.name,
-                        temperature=0.0,
-                        extra_instructions=extra_text,
-                    )
-                except Exception as e:
-                    console.print(f"[yellow]Model '{model}' failed on {file_path.name}: {e}[/yellow]")
-                    new_code = original_code
-
-                # Write improved file (flatten nested names if needed)
-                out_file = out_repo / file_path.name
-                try:
-                    out_file.write_text(new_code, encoding="utf-8")
-                except Exception:
-                    out_file = out_repo / file_path.name.replace(os.sep, "_")
-                    out_file.write_text(new_code, encoding="utf-8")
-
-                # Best-effort tests copy for python files
-                if copy_tests and file_path.suffix == ".py":
-                    _copy_tests_for_file(file_path, out_repo)
-
-                progress.advance(task)
+    _run_refactors(console, cfg, file_paths, model_ids, model_dirs, extra_text, copy_tests)
 
     # Analyze collections per model
     console.print(Align.center("[bold blue]📊 Scoring generated code[/bold blue]"))